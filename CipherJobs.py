@@ -0,0 +1,231 @@
+#! /usr/bin/python3
+
+"""
+Cipher Jobs
+
+Runs the stream ciphers from CipherInfo over whole files, reading the input in
+chunks so large files never have to fit in memory. Progress is recorded in a
+small JSON journal (bytes processed, output offset and cipher state) every
+`CheckpointBytes` of input, so an interrupted job can be restarted and will
+continue from its last checkpoint. The finished output is byte-for-byte the
+same as an uninterrupted run.
+
+Caesar Square is a whole-text transposition and cannot be streamed, so it is
+not supported here.
+"""
+
+import codecs
+import hashlib
+import json
+import os
+from typing import Optional
+from CipherInfo import * # Import cipher information, methods
+
+JournalVersion : int = 1
+DefaultChunkBytes : int = 1 << 20 # 1 MiB read per chunk
+DefaultCheckpointBytes : int = 16 << 20 # Journal written every 16 MiB of input
+
+def _NewState(CipherName : str ) -> dict :
+    """Returns the initial streaming state for a cipher.
+
+    Args:
+        CipherName: The `name` of one of the cipher classes in CipherInfo.
+
+    Returns:
+        A JSON serialisable dictionary holding the cipher state.
+    """
+    if CipherName == VigenereCipher.name:
+        # Position in the key of the next alphabetic character
+        return {"key_index": 0}
+    if CipherName == MorseCode.name:
+        # Txt2MorseCode strips its output, so leading whitespace is dropped
+        # until something visible is written and trailing whitespace is held
+        # back until we know it is not the end of the text
+        return {"started": False, "pending": ""}
+    return {}
+
+def _CheckAlphabet(Chunk : str ) -> None :
+    """Raises a clear error for letters the Caesar and Vigenère ciphers cannot shift.
+
+    Args:
+        Chunk: The next piece of the input text, already uppercased.
+    """
+    # Only the distinct characters need checking, which keeps this cheap
+    BadChars : list = [char for char in set(Chunk) if char.isalpha() and char not in Alphabet]
+    if BadChars:
+        char : str = min(BadChars, key=Chunk.index)
+        raise ValueError(f"{char!r} is not in the alphabet {Alphabet}")
+
+def _EncryptChunk(CipherName : str , Chunk : str , Key , State : dict ) -> str :
+    """Encrypts one chunk of a stream, updating the cipher state in place.
+
+    Args:
+        CipherName: The `name` of one of the cipher classes in CipherInfo.
+        Chunk: The next piece of the input text.
+        Key: The Caesar shift or Vigenère keyword, unused by the other ciphers.
+        State: The streaming state returned by `_NewState`.
+
+    Returns:
+        The encrypted text that can be written out for this chunk.
+    """
+    if CipherName == CaesarCipher.name:
+        _CheckAlphabet(Chunk)
+        return Txt2Caeser(Chunk, Key)
+
+    if CipherName == AtbashCipher.name:
+        return Txt2Atbash(Chunk)
+
+    if CipherName == VigenereCipher.name:
+        if not Key:
+            return ""
+        _CheckAlphabet(Chunk)
+        # Rotate the key so the chunk starts on the right key letter
+        Offset : int = State["key_index"] % len(Key)
+        EncryptedText : str = Txt2Vigenere(Chunk, Key[Offset:] + Key[:Offset])
+        State["key_index"] = (Offset + sum(char.isalpha() for char in Chunk)) % len(Key)
+        return EncryptedText
+
+    if CipherName == MorseCode.name:
+        Pieces : list = [
+            MorseCodeDict[char] + " " if char in MorseCodeDict else char + "/"
+            for char in Chunk
+        ]
+        Text : str = State["pending"] + "".join(Pieces)
+        if not State["started"]:
+            Text = Text.lstrip()
+        Visible : str = Text.rstrip()
+        State["pending"] = Text[len(Visible):]
+        State["started"] = State["started"] or bool(Visible)
+        return Visible
+
+    raise ValueError(f"{CipherName} cannot be run as a file job")
+
+def _WriteJournal(JournalPath : str , Journal : dict ) -> None :
+    """Atomically replaces the journal file with the given contents.
+
+    Args:
+        JournalPath: Path of the journal file.
+        Journal: The checkpoint to record.
+    """
+    TempPath : str = JournalPath + ".tmp"
+    with open(TempPath, "w", encoding="utf-8") as JournalFile:
+        json.dump(Journal, JournalFile)
+        JournalFile.flush()
+        os.fsync(JournalFile.fileno())
+    os.replace(TempPath, JournalPath)
+
+def _ReadJournal(JournalPath : str , Expected : dict ) -> Optional[dict] :
+    """Loads a journal and checks that it belongs to the job being run.
+
+    Args:
+        JournalPath: Path of the journal file.
+        Expected: The job description fields the journal must match.
+
+    Returns:
+        The stored checkpoint, or None if there is no usable journal for this
+        job, in which case the job starts over.
+    """
+    try:
+        with open(JournalPath, "r", encoding="utf-8") as JournalFile:
+            Journal : dict = json.load(JournalFile)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(Journal, dict):
+        return None
+    for field, value in Expected.items():
+        if Journal.get(field) != value:
+            # Written for a different job, eg the input or key has changed
+            return None
+    return Journal
+
+def EncryptFile(InputPath : str , OutputPath : str , CipherName : str , Key = None ,
+                JournalPath : str = None , CheckpointBytes : int = DefaultCheckpointBytes ,
+                ChunkBytes : int = DefaultChunkBytes ) -> int :
+    """Encrypts a UTF-8 text file with a stream cipher, resuming if a journal exists.
+
+    The input is uppercased chunk by chunk, matching what the app does with the
+    message box. A checkpoint is written after every `CheckpointBytes` of input;
+    larger values lower the overhead, smaller values lose less work on a crash.
+    The journal is removed once the job completes, and ignored if it does not
+    match this job or the output file is missing or shorter than the last
+    checkpoint.
+
+    Args:
+        InputPath: The plain text file to read.
+        OutputPath: The file the ciphertext is written to.
+        CipherName: The `name` of the cipher class, eg `VigenereCipher.name`.
+        Key: The Caesar shift or Vigenère keyword, if the cipher needs one.
+        JournalPath: Where to keep the checkpoint journal, defaults to OutputPath + ".journal".
+        CheckpointBytes: How many input bytes to process between checkpoints.
+        ChunkBytes: How many input bytes to read at a time.
+
+    Returns:
+        The size of the finished output file in bytes.
+    """
+    if CipherName not in (CaesarCipher.name, AtbashCipher.name, VigenereCipher.name, MorseCode.name):
+        raise ValueError(f"{CipherName} cannot be run as a file job")
+    if CheckpointBytes <= 0 or ChunkBytes <= 0:
+        raise ValueError("CheckpointBytes and ChunkBytes must be positive")
+    if CipherName == CaesarCipher.name and (not isinstance(Key, int) or isinstance(Key, bool)):
+        raise ValueError("A Caesar job needs an integer shift as its key")
+    if CipherName == VigenereCipher.name:
+        if not isinstance(Key, str) or (Key and not (Key.isascii() and Key.isalpha())):
+            raise ValueError("A Vigenère job needs a keyword of letters A - Z as its key")
+        Key = Key.upper()
+
+    if JournalPath is None:
+        JournalPath = OutputPath + ".journal"
+
+    InputStat = os.stat(InputPath)
+    Expected : dict = {
+        "version": JournalVersion,
+        "cipher": CipherName,
+        # Only a digest, so the key is not left in plain text next to the ciphertext
+        "key_digest": hashlib.sha256(repr(Key).encode("utf-8")).hexdigest(),
+        "input_size": InputStat.st_size,
+        "input_mtime_ns": InputStat.st_mtime_ns, # Catches same size edits
+    }
+    Journal : Optional[dict] = _ReadJournal(JournalPath, Expected)
+    if (Journal is None or not os.path.exists(OutputPath)
+            or os.path.getsize(OutputPath) < Journal["output_offset"]):
+        # Start over if the output no longer holds everything checkpointed
+        Journal = dict(Expected, bytes_processed=0, output_offset=0, state=_NewState(CipherName))
+
+    State : dict = Journal["state"]
+    BytesProcessed : int = Journal["bytes_processed"]
+    OutputOffset : int = Journal["output_offset"]
+    LastCheckpoint : int = BytesProcessed
+    Decoder = codecs.getincrementaldecoder("utf-8")()
+
+    with open(InputPath, "rb") as InputFile, open(OutputPath, "r+b" if OutputOffset else "wb") as OutputFile:
+        # Drop anything written after the last checkpoint
+        InputFile.seek(BytesProcessed)
+        OutputFile.seek(OutputOffset)
+        OutputFile.truncate()
+
+        while True:
+            Data : bytes = InputFile.read(ChunkBytes)
+            Final : bool = not Data
+            Chunk : str = Decoder.decode(Data, final=Final)
+            Encrypted : bytes = _EncryptChunk(CipherName, Chunk.upper(), Key, State).encode("utf-8")
+            OutputFile.write(Encrypted)
+            OutputOffset += len(Encrypted)
+            # Bytes of a split character stay in the decoder until the next read
+            BytesProcessed += len(Data)
+            if Final:
+                break
+
+            if BytesProcessed - LastCheckpoint >= CheckpointBytes:
+                OutputFile.flush()
+                os.fsync(OutputFile.fileno())
+                Journal.update(
+                    bytes_processed=BytesProcessed - len(Decoder.getstate()[0]),
+                    output_offset=OutputOffset,
+                    state=State,
+                )
+                _WriteJournal(JournalPath, Journal)
+                LastCheckpoint = BytesProcessed
+
+    if os.path.exists(JournalPath):
+        os.remove(JournalPath)
+    return OutputOffset
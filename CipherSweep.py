@@ -0,0 +1,138 @@
+#! /usr/bin/python3
+
+"""
+Cipher Sweep
+
+Encrypts one message under many Caesar shifts or Vigenère keys at once, for
+generating test vectors or previewing key rotations. The message is scanned a
+single time into a numpy array and each batch of keys is applied as one 2-D
+(keys x positions) computation. Ciphertexts are yielded one at a time and keys
+are processed in batches, so memory stays bounded however many keys are swept.
+
+The results match `Txt2Caeser` and `Txt2Vigenere` called once per key, except
+that the sweeps are stricter about their input: every Vigenère key must be
+made of the letters A - Z, and a message with letters outside A - Z raises
+even where a single call would not have looked at them (eg a Vigenère key
+that is empty). Errors are raised before any result is yielded.
+"""
+
+import numpy as np
+from CipherInfo import * # Import cipher information, methods
+
+BatchElements : int = 1 << 22 # Upper bound on keys x characters computed per batch
+
+def _EncodeMessage(InputString : str ) -> tuple :
+    """Converts a message into the arrays shared by every key in a sweep.
+
+    The message is held as UTF-8 bytes, so text with the odd non-ASCII
+    character costs no more than plain ASCII. Letters A - Z are single bytes
+    and every byte of a multi-byte character is 0x80 or above, so the two
+    never mix.
+
+    Args:
+        InputString: The input text string to be encrypted.
+
+    Returns:
+        A tuple of (Base, Letters, IsLetter). Letters holds the alphabet index
+        (A = 0) of each letter and 0 elsewhere, Base the byte "A" at letters
+        and the message byte elsewhere, so Base + Letters gives back the
+        message.
+    """
+    for char in InputString:
+        if char.isalpha() and char not in Alphabet:
+            # Same failure as Alphabet.index(char) in the single key ciphers
+            raise ValueError(f"{char!r} is not in the alphabet {Alphabet}")
+
+    Codes = np.frombuffer(InputString.encode("utf-8"), dtype=np.uint8)
+    IsLetter = (Codes >= ord("A")) & (Codes <= ord("Z"))
+    Letters = np.where(IsLetter, Codes - ord("A"), 0).astype(np.uint8)
+    Base = np.where(IsLetter, ord("A"), Codes).astype(np.uint8)
+    return Base, Letters, IsLetter
+
+def _ApplyShifts(Base , Letters , Shifts ):
+    """Shifts the letters of the message by a (keys x positions) matrix of shifts.
+
+    Args:
+        Base: The base bytes returned by `_EncodeMessage`.
+        Letters: The alphabet index of each letter, 0 elsewhere.
+        Shifts: A uint8 array of shifts in 0 - 25, one row per key, which must
+            be 0 wherever the message is not a letter.
+
+    Yields:
+        The encrypted text for each row of Shifts.
+    """
+    Shifted = Letters + Shifts # Both below 26, so this cannot overflow a uint8
+    # Subtracting 26 wraps a uint8 below 26 round to 230 or more, so the
+    # minimum is the sum taken modulo 26 without any comparisons
+    np.minimum(Shifted, Shifted - np.uint8(26), out=Shifted)
+    Batch = np.add(Shifted, Base, out=Shifted)
+    for row in Batch:
+        yield row.tobytes().decode("utf-8")
+
+def SweepCaesar(InputString : str , Shifts ):
+    """Encrypts a text string using the Caesar cipher under many shifts.
+
+    Shifts that are equal modulo 26 give the same ciphertext, so only the
+    distinct shifts asked for are computed, at most 26 of them, in batches
+    bounded by `BatchElements`.
+
+    Args:
+        InputString: The input text string to be encrypted.
+        Shifts: An iterable of integer shift values, eg range(26).
+
+    Yields:
+        A (shift, encrypted text) tuple for each shift, in the order given.
+    """
+    Shifts : list = list(Shifts)
+    Base, Letters, IsLetter = _EncodeMessage(InputString)
+    Step : int = max(1, BatchElements // max(1, len(Base)))
+    Needed : list = sorted({shift % 26 for shift in Shifts})
+
+    Ciphertexts : dict = {}
+    for start in range(0, len(Needed), Step):
+        BatchShifts : list = Needed[start:start + Step]
+        Rows = np.array(BatchShifts, dtype=np.uint8)[:, None] * IsLetter.astype(np.uint8)
+        Ciphertexts.update(zip(BatchShifts, _ApplyShifts(Base, Letters, Rows)))
+
+    for shift in Shifts:
+        yield shift, Ciphertexts[shift % 26]
+
+def SweepVigenere(InputString : str , Keys ):
+    """Encrypts a text string using the Vigenère cipher under many keys.
+
+    Keys are grouped by length so each group is a single 2-D computation, which
+    means results come out grouped by key length rather than in input order.
+
+    Args:
+        InputString: The input text string to be encrypted.
+        Keys: An iterable of keyword strings.
+
+    Yields:
+        A (key, encrypted text) tuple for each key.
+    """
+    # Group the keys by length, they then share the same key index per letter
+    Groups : dict = {}
+    for key in Keys:
+        if not (isinstance(key, str) and (not key or (key.isascii() and key.isalpha()))):
+            raise ValueError(f"Vigenère key {key!r} must only contain letters A - Z")
+        Groups.setdefault(len(key), []).append(key)
+
+    Base, Letters, IsLetter = _EncodeMessage(InputString)
+    Step : int = max(1, BatchElements // max(1, len(Base)))
+    LetterCount = np.cumsum(IsLetter) - 1 # Key index of each letter before wrapping
+
+    for key_length, GroupKeys in Groups.items():
+        if not key_length:
+            # Txt2Vigenere returns an empty string for an empty key
+            for key in GroupKeys:
+                yield key, ""
+            continue
+
+        # Non letters point at an extra key column holding a shift of 0
+        KeyIndex = np.where(IsLetter, LetterCount % key_length, key_length)
+        for start in range(0, len(GroupKeys), Step):
+            BatchKeys : list = GroupKeys[start:start + Step]
+            KeyText : str = "".join(BatchKeys)
+            KeyShifts = np.zeros((len(BatchKeys), key_length + 1), dtype=np.uint8)
+            KeyShifts[:, :key_length] = np.frombuffer(KeyText.upper().encode("ascii"), dtype=np.uint8).reshape(len(BatchKeys), key_length) - ord("A")
+            yield from zip(BatchKeys, _ApplyShifts(Base, Letters, KeyShifts[:, KeyIndex]))